@@ -5,14 +5,25 @@ AI Integration Specific Test - Verify LLM analysis works with different task typ
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from tests.ai_polling import wait_for_ai_analysis
 
 BASE_URL = "https://taskoptimizer.preview.emergentagent.com"
 API_BASE = f"{BASE_URL}/api"
 
+# Shared keep-alive session so repeated calls reuse one TLS connection
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                                      max_retries=Retry(total=3, backoff_factor=0.3)))
+SESSION.headers.update({"Content-Type": "application/json"})
+
 def test_ai_analysis_variety():
     """Test AI analysis with different types of tasks"""
-    session = requests.Session()
+    session = SESSION
     
     test_tasks = [
         {
@@ -35,22 +46,23 @@ def test_ai_analysis_variety():
         }
     ]
     
-    results = []
-    
-    for i, task_data in enumerate(test_tasks):
+    def _run(i, task_data):
+        # Buffer output so concurrent tasks don't interleave their lines
+        lines = [f"Testing AI analysis for task {i+1}: {task_data['title']}"]
         try:
-            print(f"Testing AI analysis for task {i+1}: {task_data['title']}")
-            
             response = session.post(f"{API_BASE}/tasks", json=task_data, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                task_id = response.json()["id"]
+                response = wait_for_ai_analysis(session, f"{API_BASE}/tasks/{task_id}")
+                data = response.json() if response.status_code == 200 else {}
                 
-                # Verify AI analysis fields
+                # Verify the background analysis finished and filled the AI fields
                 ai_fields = ["estimated_hours", "complexity", "ai_analysis", "tags"]
+                ai_completed = data.get("ai_status") == "completed"
                 has_ai_data = all(field in data and data[field] for field in ai_fields)
                 
-                if has_ai_data:
+                if ai_completed and has_ai_data:
                     result = {
                         "task": task_data["title"],
                         "success": True,
@@ -61,41 +73,51 @@ def test_ai_analysis_variety():
                         "expected_complexity": task_data["expected_complexity"],
                         "complexity_match": data["complexity"] == task_data["expected_complexity"]
                     }
-                    print(f"✅ AI Analysis Success:")
-                    print(f"   Estimated: {data['estimated_hours']}h")
-                    print(f"   Complexity: {data['complexity']} (expected: {task_data['expected_complexity']})")
-                    print(f"   Tags: {data['tags']}")
-                    print(f"   Analysis: {data['ai_analysis'][:100]}...")
+                    lines.append(f"✅ AI Analysis Success:")
+                    lines.append(f"   Estimated: {data['estimated_hours']}h")
+                    lines.append(f"   Complexity: {data['complexity']} (expected: {task_data['expected_complexity']})")
+                    lines.append(f"   Tags: {data['tags']}")
+                    lines.append(f"   Analysis: {data['ai_analysis'][:100]}...")
                 else:
+                    error = "Missing AI analysis fields" if ai_completed else \
+                        f"AI analysis not completed (HTTP {response.status_code}, status {data.get('ai_status')})"
                     result = {
                         "task": task_data["title"],
                         "success": False,
-                        "error": "Missing AI analysis fields"
+                        "error": error
                     }
-                    print(f"❌ AI Analysis Failed: Missing fields")
-                
-                results.append(result)
+                    lines.append(f"❌ AI Analysis Failed: {error}")
                 
                 # Clean up - delete the task
-                session.delete(f"{API_BASE}/tasks/{data['id']}")
+                session.delete(f"{API_BASE}/tasks/{task_id}")
                 
             else:
-                print(f"❌ Task creation failed: HTTP {response.status_code}")
-                results.append({
+                lines.append(f"❌ Task creation failed: HTTP {response.status_code}")
+                result = {
                     "task": task_data["title"],
                     "success": False,
                     "error": f"HTTP {response.status_code}"
-                })
+                }
                 
         except Exception as e:
-            print(f"❌ Error testing task {i+1}: {str(e)}")
-            results.append({
+            lines.append(f"❌ Error testing task {i+1}: {str(e)}")
+            result = {
                 "task": task_data["title"],
                 "success": False,
                 "error": str(e)
-            })
+            }
         
+        return result, lines
+    
+    # Run all tasks in parallel over the shared connection pool
+    with ThreadPoolExecutor(max_workers=len(test_tasks)) as ex:
+        outcomes = list(ex.map(_run, range(len(test_tasks)), test_tasks))
+    
+    results = []
+    for result, lines in outcomes:
+        print("\n".join(lines))
         print()
+        results.append(result)
     
     # Summary
     successful = sum(1 for r in results if r["success"])
@@ -1,13 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timezone, date, time, timedelta
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Union
+from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
 import uuid
 import asyncio
 import math
+import hashlib
+import re
+import orjson
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
@@ -15,7 +22,7 @@ from emergentintegrations.llm.chat import LlmChat, UserMessage
 load_dotenv()
 
 # Initialize FastAPI app
-app = FastAPI(title="Workflow Organizer API")
+app = FastAPI(title="Workflow Organizer API", default_response_class=ORJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -30,15 +37,112 @@ app.add_middleware(
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "workflow_organizer")
 
-client = AsyncIOMotorClient(MONGO_URL)
+# tz_aware so stored deadlines come back as UTC-aware datetimes
+client = AsyncIOMotorClient(MONGO_URL, tz_aware=True)
 db = client[DB_NAME]
 
+# AI analysis cache settings
+AI_CACHE_TTL_SECONDS = 7 * 24 * 3600  # 1 week
+AI_CACHE_MAX_ENTRIES = 1024
+ai_analysis_memory_cache = LRUCache(maxsize=AI_CACHE_MAX_ENTRIES)
+AI_BATCH_SIZE = 20  # Max tasks per batched LLM request
+AI_MAX_CONCURRENT_REQUESTS = 8
+# Shared across all requests so concurrent endpoints respect provider limits
+llm_semaphore = asyncio.Semaphore(AI_MAX_CONCURRENT_REQUESTS)
+
+# Recommendation settings
+URGENCY_REFRESH_SECONDS = 3600  # Recompute stored urgency scores hourly
+RECOMMENDATION_CANDIDATES = 50  # Most urgent tasks considered per day
+RECOMMENDATIONS_CACHE_TTL_SECONDS = 30
+recommendations_cache = TTLCache(maxsize=4, ttl=RECOMMENDATIONS_CACHE_TTL_SECONDS)
+recommendations_lock = asyncio.Lock()
+# Bumped on every task write so cached recommendations are never stale
+tasks_version = 0
+
+def invalidate_recommendations():
+    global tasks_version
+    tasks_version += 1
+
+@app.on_event("startup")
+async def create_indexes():
+    try:
+        # Expire cached AI analyses after a week
+        await db.ai_analysis_cache.create_index("ts", expireAfterSeconds=AI_CACHE_TTL_SECONDS)
+        
+        # Point lookups by task id and status filters for recommendations
+        await db.tasks.create_index("id", unique=True)
+        await db.tasks.create_index("status")
+        await db.tasks.create_index("deadline")
+        await db.tasks.create_index([("status", 1), ("deadline", 1)])
+        await db.tasks.create_index([("status", 1), ("urgency_score", -1)])
+        
+        # Recent completions for analytics
+        await db.learning_data.create_index([("completion_date", -1)])
+    except Exception as e:
+        print(f"Index creation error: {e}")
+
+@app.on_event("startup")
+async def migrate_string_deadlines():
+    # Older tasks stored deadlines as ISO strings; convert them to BSON dates.
+    # Strings that don't parse are left as they are rather than failing startup.
+    try:
+        await db.tasks.update_many(
+            {"deadline": {"$type": "string"}},
+            [{"$set": {"deadline": {"$convert": {
+                "input": "$deadline", "to": "date", "onError": "$deadline", "onNull": None
+            }}}}]
+        )
+    except Exception as e:
+        print(f"Deadline migration error: {e}")
+
+@app.on_event("startup")
+async def build_learning_aggregates():
+    # Seed the running sums from history when the aggregate is missing, and rebuild
+    # them when their count has drifted from learning_data (see update_task)
+    try:
+        aggregate = await db.learning_aggregates.find_one({"_id": LEARNING_AGGREGATE_ID}, {"count": 1})
+        history_count = await db.learning_data.count_documents({})
+        if aggregate and aggregate.get("count", 0) == history_count:
+            return
+        
+        fields: Dict[str, Any] = {"count": 0}
+        async for item in db.learning_data.find({}, {"_id": 0, "estimated_hours": 1, "actual_hours": 1, "complexity": 1, "tags": 1}):
+            update = learning_aggregate_update(item['estimated_hours'], item['actual_hours'], item['complexity'], item['tags'])
+            for field, value in update["$inc"].items():
+                fields[field] = fields.get(field, 0) + value
+            fields.update(update.get("$set", {}))
+        document = nest_fields(fields)
+        
+        if aggregate is None:
+            # $setOnInsert so workers starting together can't count history twice
+            await db.learning_aggregates.update_one(
+                {"_id": LEARNING_AGGREGATE_ID}, {"$setOnInsert": document}, upsert=True
+            )
+        else:
+            await db.learning_aggregates.replace_one({"_id": LEARNING_AGGREGATE_ID}, document)
+    except DuplicateKeyError:
+        pass  # Another worker seeded the aggregate first
+    except Exception as e:
+        print(f"Learning aggregate seeding error: {e}")
+
+urgency_refresh_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_urgency_refresh():
+    # Keep a reference so the background task isn't garbage collected
+    global urgency_refresh_task
+    urgency_refresh_task = asyncio.create_task(refresh_urgency_scores_periodically())
+
+def ensure_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 # Pydantic models
 class Task(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
     description: str
-    deadline: str  # ISO format date
+    deadline: datetime  # Stored as a BSON date
     priority: str = "medium"  # low, medium, high
     complexity: str = "medium"  # small, medium, large
     estimated_hours: float = 0
@@ -48,14 +152,25 @@ class Task(BaseModel):
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     ai_analysis: Optional[str] = None
+    ai_status: str = "completed"  # pending, completed
+    
+    @field_validator('deadline')
+    @classmethod
+    def deadline_utc(cls, v: datetime) -> datetime:
+        return ensure_utc(v)
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    deadline: Optional[str] = None
+    deadline: Optional[datetime] = None
     priority: Optional[str] = None
     actual_hours: Optional[float] = None
     status: Optional[str] = None
+    
+    @field_validator('deadline')
+    @classmethod
+    def deadline_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        return ensure_utc(v) if v else v
 
 class BulkTaskImport(BaseModel):
     task_text: str
@@ -95,61 +210,113 @@ class LearningData(BaseModel):
     completion_date: str
     notes: Optional[str] = None
 
+# LLM client configuration, resolved once at import
+LLM_API_KEY = os.getenv("EMERGENT_LLM_KEY")
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+# Batch analyses can be routed to a separate (e.g. self-hosted) model
+LLM_BATCH_PROVIDER = os.getenv("LLM_BATCH_PROVIDER", LLM_PROVIDER)
+LLM_BATCH_MODEL = os.getenv("LLM_BATCH_MODEL", LLM_MODEL)
+# The reply is a small JSON object, so cap decode length per task
+LLM_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "300"))
+AI_ANALYSIS_SYSTEM_MESSAGE = (
+    "You are an expert project manager and time estimation specialist. "
+    "Analyze tasks and provide accurate time estimates and complexity assessments. "
+    "Judge complexity from the description, assume a reasonable working pace (not a burnout schedule), "
+    "add buffer time for unexpected issues, and plan within 8 AM - 4 PM working hours (8 hours/day max), "
+    "allowing for teaching breaks and reduced availability. "
+    "Reply with JSON only, no additional text."
+)
+
+def new_analysis_chat(session_prefix: str, provider: str = LLM_PROVIDER, model: str = LLM_MODEL,
+                      max_tokens: int = LLM_MAX_OUTPUT_TOKENS) -> LlmChat:
+    """Create a chat for one analysis request.
+    
+    LlmChat keeps conversation history per instance, so each request gets
+    its own session rather than sharing one client across tasks.
+    """
+    chat = LlmChat(
+        api_key=LLM_API_KEY,
+        session_id=f"{session_prefix}_{uuid.uuid4()}",
+        system_message=AI_ANALYSIS_SYSTEM_MESSAGE
+    ).with_model(provider, model)
+    return chat.with_max_tokens(max_tokens)
+
 # AI Helper Functions
-async def get_ai_task_analysis(title: str, description: str, deadline: str) -> Dict[str, Any]:
-    """Use AI to analyze task and provide estimates"""
+def parse_deadline(deadline: Union[str, datetime]) -> datetime:
+    """Return a deadline as an aware datetime, parsing legacy ISO strings"""
+    if isinstance(deadline, str):
+        deadline = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
+    return ensure_utc(deadline)
+
+def deadline_bucket(days_until: int) -> str:
+    """Coarse deadline bucket so near-identical deadlines share a cache entry"""
+    if days_until <= 1:
+        return "1d"
+    elif days_until <= 3:
+        return "3d"
+    elif days_until <= 7:
+        return "1w"
+    elif days_until <= 14:
+        return "2w"
+    elif days_until <= 31:
+        return "1m"
+    return "later"
+
+def ai_analysis_cache_key(title: str, description: str, deadline: Union[str, datetime]) -> str:
+    """Hash of normalized title/description plus deadline bucket"""
+    days_until = (parse_deadline(deadline) - datetime.now(timezone.utc)).days
+    raw = f"{title.strip().lower()}|{description.strip().lower()}|{deadline_bucket(days_until)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+async def get_cached_ai_analysis(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Look up a cached analysis in memory, then in MongoDB"""
+    if not key:
+        return None
+    if key in ai_analysis_memory_cache:
+        return dict(ai_analysis_memory_cache[key])
+    
     try:
-        # Initialize LLM chat
-        chat = LlmChat(
-            api_key=os.getenv("EMERGENT_LLM_KEY"),
-            session_id=f"task_analysis_{uuid.uuid4()}",
-            system_message="You are an expert project manager and time estimation specialist. Analyze tasks and provide accurate time estimates and complexity assessments."
-        ).with_model("openai", "gpt-4o-mini")
-        
-        # Prepare analysis prompt
-        days_until_deadline = (datetime.fromisoformat(deadline.replace('Z', '+00:00')) - datetime.now(timezone.utc)).days
-        
-        prompt = f"""
-        Analyze this task and provide a JSON response with the following structure:
-        {{
-            "estimated_hours": <number>,
-            "complexity": "small|medium|large",
-            "suggested_tags": ["tag1", "tag2"],
-            "breakdown": "Brief explanation of time estimate",
-            "priority_suggestion": "low|medium|high",
-            "daily_effort": <hours per day recommended>
-        }}
-        
-        Task Details:
-        - Title: {title}
-        - Description: {description}
-        - Deadline: {deadline} (in {days_until_deadline} days)
-        
-        Consider:
-        1. Task complexity based on description keywords
-        2. Reasonable working pace (not burnout schedule)
-        3. Buffer time for unexpected issues
-        4. Working hours constraint: 8 AM - 4 PM (8 hours/day max)
-        5. Account for teaching breaks and reduced availability
-        
-        Provide only the JSON response, no additional text.
-        """
-        
-        user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
-        
-        # Parse AI response (basic JSON extraction)
-        import json
-        try:
-            # Extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start != -1 and json_end != -1:
-                ai_result = json.loads(response[json_start:json_end])
-                return ai_result
-        except:
-            pass
-            
+        cached = await db.ai_analysis_cache.find_one({"_id": key})
+    except Exception as e:
+        print(f"AI cache lookup error: {e}")
+        return None
+    if cached:
+        ai_analysis_memory_cache[key] = cached['result']
+        return dict(cached['result'])
+    return None
+
+async def store_ai_analysis(key: Optional[str], ai_result: Dict[str, Any]):
+    """Store a successful analysis in both cache layers"""
+    if not key:
+        return
+    ai_analysis_memory_cache[key] = ai_result
+    try:
+        await db.ai_analysis_cache.replace_one(
+            {"_id": key},
+            {"_id": key, "result": ai_result, "ts": datetime.now(timezone.utc)},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"AI cache store error: {e}")
+
+def safe_cache_key(title: str, description: str, deadline: Union[str, datetime]) -> Optional[str]:
+    try:
+        return ai_analysis_cache_key(title, description, deadline)
+    except ValueError:
+        return None
+
+async def get_ai_task_analysis(title: str, description: str, deadline: Union[str, datetime]) -> Dict[str, Any]:
+    """Use AI to analyze task and provide estimates, reusing cached analyses"""
+    key = safe_cache_key(title, description, deadline)
+    cached = await get_cached_ai_analysis(key)
+    if cached:
+        return cached
+    
+    try:
+        async with llm_semaphore:
+            ai_result = await request_ai_task_analysis(title, description, deadline)
+    except ValueError:
         # Fallback if JSON parsing fails
         return {
             "estimated_hours": 8.0,
@@ -159,11 +326,107 @@ async def get_ai_task_analysis(title: str, description: str, deadline: str) -> D
             "priority_suggestion": "medium",
             "daily_effort": 2.0
         }
-            
     except Exception as e:
         print(f"AI analysis error: {e}")
         # Fallback rule-based estimation
         return rule_based_estimation(title, description, deadline)
+    
+    await store_ai_analysis(key, ai_result)
+    return dict(ai_result)
+
+# Field list shared by the single and batch analysis prompts
+AI_ANALYSIS_SCHEMA = '"estimated_hours": number, "complexity": "small|medium|large", "suggested_tags": [string], "breakdown": string, "priority_suggestion": "low|medium|high", "daily_effort": number'
+
+def parse_ai_json(response: str, open_char: str, close_char: str) -> Any:
+    """Parse a JSON reply, tolerating text around the JSON value"""
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
+        pass
+    
+    json_start = response.find(open_char)
+    json_end = response.rfind(close_char) + 1
+    if json_start == -1 or json_end == 0:
+        raise ValueError("No JSON in AI response")
+    return orjson.loads(response[json_start:json_end])
+
+async def request_ai_task_analysis(title: str, description: str, deadline: Union[str, datetime]) -> Dict[str, Any]:
+    """Ask the LLM to analyze a task. Raises ValueError if the reply is not valid JSON."""
+    chat = new_analysis_chat("task_analysis")
+    
+    days_until_deadline = (parse_deadline(deadline) - datetime.now(timezone.utc)).days
+    prompt = (
+        f"Task: {title}\n"
+        f"Description: {description}\n"
+        f"Deadline: {deadline} (in {days_until_deadline} days)\n"
+        f"Reply with a JSON object: {{{AI_ANALYSIS_SCHEMA}}}"
+    )
+    
+    response = await chat.send_message(UserMessage(text=prompt))
+    result = parse_ai_json(response, '{', '}')
+    if not isinstance(result, dict):
+        raise ValueError("AI response is not a JSON object")
+    return result
+
+async def request_ai_batch_analysis(tasks: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Analyze several tasks with a single LLM request, keyed by their index"""
+    chat = new_analysis_chat("task_batch_analysis", LLM_BATCH_PROVIDER, LLM_BATCH_MODEL,
+                             LLM_MAX_OUTPUT_TOKENS * len(tasks))
+    
+    task_list = orjson.dumps([
+        {"idx": idx, "title": t['title'], "description": t['description'], "deadline": t['deadline']}
+        for idx, t in enumerate(tasks)
+    ]).decode()
+    prompt = (
+        f"Today: {datetime.now(timezone.utc).date().isoformat()}\n"
+        f"Tasks: {task_list}\n"
+        f"Reply with a JSON array, one object per task: {{\"idx\": number, {AI_ANALYSIS_SCHEMA}}}"
+    )
+    
+    response = await chat.send_message(UserMessage(text=prompt))
+    items = parse_ai_json(response, '[', ']')
+    if not isinstance(items, list):
+        raise ValueError("AI response is not a JSON array")
+    
+    results = {}
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get('idx'), int) and 0 <= item['idx'] < len(tasks):
+            results[item.pop('idx')] = item
+    return results
+
+async def get_ai_batch_analysis(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze many tasks, batching cache misses into as few LLM requests as possible"""
+    keys = [safe_cache_key(t['title'], t['description'], t['deadline']) for t in tasks]
+    analyses: List[Optional[Dict[str, Any]]] = list(await asyncio.gather(*[get_cached_ai_analysis(key) for key in keys]))
+    
+    misses = [i for i, analysis in enumerate(analyses) if analysis is None]
+    chunks = [misses[start:start + AI_BATCH_SIZE] for start in range(0, len(misses), AI_BATCH_SIZE)]
+    
+    async def analyze_chunk(chunk: List[int]) -> Dict[int, Dict[str, Any]]:
+        async with llm_semaphore:
+            return await request_ai_batch_analysis([tasks[i] for i in chunk])
+    
+    # Dispatch all chunks concurrently, bounded by the shared semaphore
+    chunk_results = await asyncio.gather(*[analyze_chunk(chunk) for chunk in chunks], return_exceptions=True)
+    
+    answered: List[int] = []
+    for chunk, results in zip(chunks, chunk_results):
+        if isinstance(results, Exception):
+            print(f"AI batch analysis error: {results}")
+            continue
+        for idx, i in enumerate(chunk):
+            if idx in results:
+                analyses[i] = results[idx]
+                answered.append(i)
+    
+    # Write the new analyses to the cache concurrently rather than one round-trip each
+    await asyncio.gather(*[store_ai_analysis(keys[i], analyses[i]) for i in answered])
+    
+    # Rule-based fallback for anything the model did not answer
+    return [
+        analysis if analysis is not None else rule_based_estimation(t['title'], t['description'], t['deadline'])
+        for t, analysis in zip(tasks, analyses)
+    ]
 
 def parse_bulk_tasks(task_text: str, default_priority: str = "medium") -> List[Dict[str, Any]]:
     """Parse bulk task input format like 'Opening Evening — 25 Sep 2025'"""
@@ -354,24 +617,41 @@ def generate_daily_timetable(recommended_tasks: List[Dict], available_hours: flo
     
     return timetable
 
-def rule_based_estimation(title: str, description: str, deadline: str) -> Dict[str, Any]:
+# Keywords for rule-based complexity assessment
+LARGE_KEYWORDS = ('project', 'develop', 'build', 'create', 'research', 'analyze', 'comprehensive')
+MEDIUM_KEYWORDS = ('review', 'write', 'prepare', 'design', 'plan', 'organize')
+SMALL_KEYWORDS = ('call', 'email', 'check', 'update', 'quick', 'simple')
+
+# Keywords for rule-based tag suggestions
+TAG_KEYWORDS = {
+    'teaching': ('teaching', 'class', 'lesson'),
+    'meeting': ('meeting', 'presentation'),
+    'research': ('research', 'study'),
+    'admin': ('admin', 'paperwork'),
+}
+
+def keyword_pattern(keywords) -> re.Pattern:
+    """One alternation per keyword group; matches substrings ("lessons" hits "lesson")"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+LARGE_PATTERN = keyword_pattern(LARGE_KEYWORDS)
+MEDIUM_PATTERN = keyword_pattern(MEDIUM_KEYWORDS)
+SMALL_PATTERN = keyword_pattern(SMALL_KEYWORDS)
+TAG_PATTERNS = {tag: keyword_pattern(keywords) for tag, keywords in TAG_KEYWORDS.items()}
+
+def rule_based_estimation(title: str, description: str, deadline: Union[str, datetime]) -> Dict[str, Any]:
     """Fallback rule-based estimation"""
     
-    # Keywords for complexity assessment
-    large_keywords = ['project', 'develop', 'build', 'create', 'research', 'analyze', 'comprehensive']
-    medium_keywords = ['review', 'write', 'prepare', 'design', 'plan', 'organize']
-    small_keywords = ['call', 'email', 'check', 'update', 'quick', 'simple']
-    
     text = f"{title} {description}".lower()
     
     # Determine complexity
-    if any(keyword in text for keyword in large_keywords):
+    if LARGE_PATTERN.search(text):
         complexity = "large"
         base_hours = 12.0
-    elif any(keyword in text for keyword in medium_keywords):
+    elif MEDIUM_PATTERN.search(text):
         complexity = "medium"  
         base_hours = 6.0
-    elif any(keyword in text for keyword in small_keywords):
+    elif SMALL_PATTERN.search(text):
         complexity = "small"
         base_hours = 2.0
     else:
@@ -379,7 +659,7 @@ def rule_based_estimation(title: str, description: str, deadline: str) -> Dict[s
         base_hours = 6.0
     
     # Calculate days until deadline
-    days_until = (datetime.fromisoformat(deadline.replace('Z', '+00:00')) - datetime.now(timezone.utc)).days
+    days_until = (parse_deadline(deadline) - datetime.now(timezone.utc)).days
     
     # Adjust priority based on deadline urgency
     if days_until <= 1:
@@ -394,15 +674,7 @@ def rule_based_estimation(title: str, description: str, deadline: str) -> Dict[s
     daily_effort = min(6.0, base_hours / work_days_available)  # Cap at 6 hours/day
     
     # Generate suggested tags
-    tags = []
-    if 'teaching' in text or 'class' in text or 'lesson' in text:
-        tags.append('teaching')
-    if 'meeting' in text or 'presentation' in text:
-        tags.append('meeting')
-    if 'research' in text or 'study' in text:
-        tags.append('research')
-    if 'admin' in text or 'paperwork' in text:
-        tags.append('admin')
+    tags = [tag for tag, pattern in TAG_PATTERNS.items() if pattern.search(text)]
     if not tags:
         tags = ['general']
     
@@ -415,38 +687,64 @@ def rule_based_estimation(title: str, description: str, deadline: str) -> Dict[s
         "daily_effort": daily_effort
     }
 
-def calculate_learning_insights(learning_data: List[Dict]) -> Dict[str, Any]:
-    """Calculate insights from historical task completion data"""
-    if not learning_data:
+# Learning aggregates: running sums kept in a single document
+LEARNING_AGGREGATE_ID = "global"
+COMPLEXITY_LEVELS = ('small', 'medium', 'large')
+
+def tag_key(tag: str) -> str:
+    """Field-safe key for a tag (tags may contain '.' or '$')"""
+    return hashlib.sha1(tag.encode()).hexdigest()
+
+def learning_aggregate_update(estimated_hours: float, actual_hours: float, complexity: str, tags: List[str]) -> Dict[str, Any]:
+    """$inc/$set update that folds one completed task into the running sums"""
+    inc = {"count": 1, "est_total": estimated_hours, "act_total": actual_hours}
+    tag_names = {}
+    if complexity in COMPLEXITY_LEVELS:
+        inc[f"complexity.{complexity}.count"] = 1
+        inc[f"complexity.{complexity}.est"] = estimated_hours
+        inc[f"complexity.{complexity}.act"] = actual_hours
+    for tag in set(tags):
+        key = tag_key(tag)
+        inc[f"tags.{key}.est"] = estimated_hours
+        inc[f"tags.{key}.act"] = actual_hours
+        tag_names[f"tags.{key}.name"] = tag
+    
+    update = {"$inc": inc}
+    if tag_names:
+        update["$set"] = tag_names
+    return update
+
+def nest_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand dotted update paths (as used by learning_aggregate_update) into a nested document"""
+    document: Dict[str, Any] = {}
+    for path, value in fields.items():
+        *parents, leaf = path.split('.')
+        node = document
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return document
+
+def calculate_learning_insights(aggregate: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Calculate insights from the running learning aggregates"""
+    if not aggregate or not aggregate.get('count'):
         return {"pace_factor": 1.0, "complexity_adjustments": {}, "tag_insights": {}}
     
-    # Calculate overall pace factor (how user performs vs estimates)
-    total_estimated = sum(item['estimated_hours'] for item in learning_data)
-    total_actual = sum(item['actual_hours'] for item in learning_data)
+    def ratio(sums: Dict[str, Any], est_field: str = 'est', act_field: str = 'act') -> float:
+        return sums[act_field] / sums[est_field] if sums[est_field] > 0 else 1.0
     
-    pace_factor = total_actual / total_estimated if total_estimated > 0 else 1.0
+    # Overall pace factor (how user performs vs estimates)
+    pace_factor = ratio(aggregate, 'est_total', 'act_total')
     
-    # Calculate complexity-specific adjustments
-    complexity_adjustments = {}
-    for complexity in ['small', 'medium', 'large']:
-        complexity_items = [item for item in learning_data if item['complexity'] == complexity]
-        if complexity_items:
-            est_sum = sum(item['estimated_hours'] for item in complexity_items)
-            act_sum = sum(item['actual_hours'] for item in complexity_items)
-            complexity_adjustments[complexity] = act_sum / est_sum if est_sum > 0 else 1.0
+    # Complexity-specific adjustments
+    complexity_adjustments = {
+        complexity: ratio(sums)
+        for complexity, sums in aggregate.get('complexity', {}).items()
+        if sums.get('count')
+    }
     
     # Tag-based insights
-    tag_insights = {}
-    all_tags = set()
-    for item in learning_data:
-        all_tags.update(item['tags'])
-    
-    for tag in all_tags:
-        tag_items = [item for item in learning_data if tag in item['tags']]
-        if tag_items:
-            est_sum = sum(item['estimated_hours'] for item in tag_items)
-            act_sum = sum(item['actual_hours'] for item in tag_items)
-            tag_insights[tag] = act_sum / est_sum if est_sum > 0 else 1.0
+    tag_insights = {sums['name']: ratio(sums) for sums in aggregate.get('tags', {}).values()}
     
     return {
         "pace_factor": pace_factor,
@@ -454,31 +752,61 @@ def calculate_learning_insights(learning_data: List[Dict]) -> Dict[str, Any]:
         "tag_insights": tag_insights
     }
 
-# Helper functions
-def prepare_for_mongo(data):
-    """Convert data for MongoDB storage"""
-    if isinstance(data, dict):
-        return {k: prepare_for_mongo(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [prepare_for_mongo(item) for item in data]
-    elif isinstance(data, datetime):
-        return data.isoformat()
-    elif isinstance(data, date):
-        return data.isoformat()
-    elif isinstance(data, time):
-        return data.strftime('%H:%M:%S')
-    return data
+async def get_learning_insights() -> Dict[str, Any]:
+    aggregate = await db.learning_aggregates.find_one({"_id": LEARNING_AGGREGATE_ID})
+    return calculate_learning_insights(aggregate)
+
+# Urgency scoring
+PRIORITY_WEIGHTS = {"high": 3, "medium": 2, "low": 1}
+
+def task_urgency_score(deadline: Union[str, datetime], priority: str) -> float:
+    """Score tasks by urgency and priority; higher is more urgent"""
+    days_until = (parse_deadline(deadline) - datetime.now(timezone.utc)).days
+    
+    # Urgency decreases as days increase
+    return max(1, 10 / max(1, days_until)) * PRIORITY_WEIGHTS.get(priority, 2)
+
+def with_urgency_score(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the stored urgency_score used to sort recommendations in MongoDB"""
+    task_data['urgency_score'] = task_urgency_score(task_data['deadline'], task_data.get('priority', 'medium'))
+    return task_data
+
+# Deadline as a date; unparseable or missing values become null, which scores as due now
+DEADLINE_AS_DATE = {"$convert": {"input": "$deadline", "to": "date", "onError": None, "onNull": None}}
+
+# Same formula as task_urgency_score, evaluated server-side
+URGENCY_SCORE_PIPELINE = [{"$set": {"urgency_score": {"$multiply": [
+    {"$max": [1, {"$divide": [10, {"$max": [1, {"$floor": {"$divide": [
+        {"$subtract": [DEADLINE_AS_DATE, "$$NOW"]},
+        86400000
+    ]}}]}]}]},
+    {"$switch": {
+        "branches": [
+            {"case": {"$eq": ["$priority", "high"]}, "then": PRIORITY_WEIGHTS["high"]},
+            {"case": {"$eq": ["$priority", "low"]}, "then": PRIORITY_WEIGHTS["low"]},
+        ],
+        "default": PRIORITY_WEIGHTS["medium"]
+    }}
+]}}}]
+
+async def refresh_urgency_scores():
+    """Recompute urgency scores for open tasks as deadlines approach"""
+    await db.tasks.update_many({"status": {"$in": ["pending", "in_progress"]}}, URGENCY_SCORE_PIPELINE)
+
+async def refresh_urgency_scores_periodically():
+    while True:
+        try:
+            await refresh_urgency_scores()
+        except Exception as e:
+            print(f"Urgency refresh error: {e}")
+        await asyncio.sleep(URGENCY_REFRESH_SECONDS)
 
+# Helper functions
 def parse_from_mongo(item):
     """Parse data from MongoDB"""
-    from bson import ObjectId
-    if isinstance(item, dict):
-        # Remove MongoDB's _id field to avoid ObjectId serialization issues
-        return {k: parse_from_mongo(v) for k, v in item.items() if k != '_id'}
-    elif isinstance(item, list):
-        return [parse_from_mongo(i) for i in item]
-    elif isinstance(item, ObjectId):
-        return str(item)
+    # Remove MongoDB's _id field to avoid ObjectId serialization issues.
+    # Documents are stored flat from model_dump, so no nested ObjectIds exist.
+    item.pop('_id', None)
     return item
 
 # API Routes
@@ -496,14 +824,13 @@ async def bulk_import_tasks(bulk_import: BulkTaskImport):
         if not parsed_tasks:
             raise HTTPException(status_code=400, detail="No valid tasks found in the input")
         
-        created_tasks = []
+        # Get AI analysis for all tasks in batched requests
+        analyses = await get_ai_batch_analysis(parsed_tasks)
         
-        for task_data in parsed_tasks:
-            # Get AI analysis for each task
-            ai_analysis = await get_ai_task_analysis(task_data['title'], task_data['description'], task_data['deadline'])
-            
+        tasks = []
+        for task_data, ai_analysis in zip(parsed_tasks, analyses):
             # Create task with AI insights
-            task = Task(
+            tasks.append(Task(
                 title=task_data['title'],
                 description=task_data['description'],
                 deadline=task_data['deadline'],
@@ -512,15 +839,12 @@ async def bulk_import_tasks(bulk_import: BulkTaskImport):
                 estimated_hours=ai_analysis.get('estimated_hours', 2.0),
                 tags=ai_analysis.get('suggested_tags', []),
                 ai_analysis=ai_analysis.get('breakdown', '')
-            )
-            
-            # Prepare for database
-            task_data_prepared = prepare_for_mongo(task.dict())
-            
-            # Insert into database
-            result = await db.tasks.insert_one(task_data_prepared)
-            if result.inserted_id:
-                created_tasks.append(task.dict())
+            ))
+        
+        # Insert into database in one round-trip
+        result = await db.tasks.insert_many([with_urgency_score(task.model_dump()) for task in tasks])
+        invalidate_recommendations()
+        created_tasks = [task.model_dump() for task in tasks[:len(result.inserted_ids)]]
         
         return {
             "message": f"Successfully created {len(created_tasks)} tasks",
@@ -531,33 +855,109 @@ async def bulk_import_tasks(bulk_import: BulkTaskImport):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error importing tasks: {str(e)}")
 
-@app.post("/api/tasks", response_model=Task)
-async def create_task(task: Task):
+def merge_tags(tags: List[str], suggested_tags: Optional[List[str]]) -> List[str]:
+    """Combine user and AI-suggested tags, keeping order and dropping repeats"""
+    return list(dict.fromkeys([*tags, *(suggested_tags or [])]))
+
+async def fill_ai_task_analysis(task_id: str, title: str, description: str, deadline: Union[str, datetime], user_tags: List[str]):
+    """Replace a task's provisional estimate with the AI analysis"""
     try:
-        # Get AI analysis for the task
-        ai_analysis = await get_ai_task_analysis(task.title, task.description, task.deadline)
+        ai_analysis = await get_ai_task_analysis(title, description, deadline)
+        
+        update_data = {
+            "tags": merge_tags(user_tags, ai_analysis.get('suggested_tags')),
+            "ai_analysis": ai_analysis.get('breakdown', ''),
+            "ai_status": "completed"
+        }
+        if 'estimated_hours' in ai_analysis:
+            update_data["estimated_hours"] = ai_analysis['estimated_hours']
+        if 'complexity' in ai_analysis:
+            update_data["complexity"] = ai_analysis['complexity']
         
-        # Update task with AI insights
-        task.estimated_hours = ai_analysis.get('estimated_hours', task.estimated_hours)
-        task.complexity = ai_analysis.get('complexity', task.complexity)
-        if ai_analysis.get('suggested_tags'):
-            task.tags.extend(ai_analysis['suggested_tags'])
-        task.ai_analysis = ai_analysis.get('breakdown', '')
+        await db.tasks.update_one({"id": task_id}, {"$set": update_data})
+        invalidate_recommendations()
+    except Exception as e:
+        print(f"Background AI analysis error for task {task_id}: {e}")
+
+@app.post("/api/tasks", response_model=Task)
+async def create_task(task: Task, background_tasks: BackgroundTasks):
+    try:
+        # Use a cached AI analysis if available; otherwise respond with a
+        # rule-based estimate and run the LLM analysis after the response
+        ai_analysis = await get_cached_ai_analysis(safe_cache_key(task.title, task.description, task.deadline))
+        ai_status = "completed"
+        if ai_analysis is None:
+            ai_analysis = rule_based_estimation(task.title, task.description, task.deadline)
+            ai_status = "pending"
         
-        # Prepare for database
-        task_data = prepare_for_mongo(task.dict())
+        # Build the stored document with AI insights in one pass
+        task_data = task.model_dump() | {
+            "estimated_hours": ai_analysis.get('estimated_hours', task.estimated_hours),
+            "complexity": ai_analysis.get('complexity', task.complexity),
+            "tags": merge_tags(task.tags, ai_analysis.get('suggested_tags')),
+            "ai_analysis": ai_analysis.get('breakdown', ''),
+            "ai_status": ai_status
+        }
         
         # Insert into database
-        result = await db.tasks.insert_one(task_data)
+        result = await db.tasks.insert_one(with_urgency_score(task_data))
+        invalidate_recommendations()
         if result.inserted_id:
-            return task
+            if ai_status == "pending":
+                background_tasks.add_task(fill_ai_task_analysis, task.id, task.title, task.description, task.deadline, task.tags)
+            return task_data
         else:
             raise HTTPException(status_code=500, detail="Failed to create task")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating task: {str(e)}")
 
+@app.post("/api/tasks/batch", response_model=List[Task])
+async def create_tasks_batch(tasks: List[Task]):
+    if not tasks:
+        raise HTTPException(status_code=400, detail="No tasks provided")
+    
+    try:
+        # Get AI analysis for all tasks in batched requests
+        analyses = await get_ai_batch_analysis([task.model_dump() for task in tasks])
+        
+        # Build the stored documents the same way create_task does
+        tasks_data = [
+            task.model_dump() | {
+                "estimated_hours": ai_analysis.get('estimated_hours', task.estimated_hours),
+                "complexity": ai_analysis.get('complexity', task.complexity),
+                "tags": merge_tags(task.tags, ai_analysis.get('suggested_tags')),
+                "ai_analysis": ai_analysis.get('breakdown', '')
+            }
+            for task, ai_analysis in zip(tasks, analyses)
+        ]
+        
+        # Insert all tasks in one round-trip
+        result = await db.tasks.insert_many([with_urgency_score(task_data) for task_data in tasks_data])
+        invalidate_recommendations()
+        if len(result.inserted_ids) == len(tasks):
+            return tasks_data
+        else:
+            raise HTTPException(status_code=500, detail="Failed to create tasks")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating tasks: {str(e)}")
+
 @app.get("/api/tasks", response_model=List[Task])
-async def get_tasks():
+async def get_tasks(fields: Optional[str] = None):
+    if fields:
+        # Comma-separated subset of task fields, e.g. ?fields=title,deadline
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in requested if f not in Task.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown task fields: {', '.join(unknown)}")
+        
+        try:
+            projection = {"_id": 0, "id": 1, **{f: 1 for f in requested}}
+            tasks = await db.tasks.find({}, projection).to_list(length=None)
+            # Partial tasks bypass Task validation
+            return ORJSONResponse(tasks)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching tasks: {str(e)}")
+    
     try:
         tasks = await db.tasks.find().to_list(length=None)
         return [Task(**parse_from_mongo(task)) for task in tasks]
@@ -578,40 +978,50 @@ async def get_task(task_id: str):
 @app.put("/api/tasks/{task_id}", response_model=Task)
 async def update_task(task_id: str, task_update: TaskUpdate):
     try:
-        # Get existing task
-        existing_task = await db.tasks.find_one({"id": task_id})
-        if not existing_task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        
         # Prepare update data
-        update_data = {k: v for k, v in task_update.dict().items() if v is not None}
+        update_data = task_update.model_dump(exclude_none=True)
         update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
         
+        # Apply the update and recompute urgency in one round-trip; values are
+        # wrapped in $literal so user text is never read as a field path
+        update_pipeline = [{"$set": {k: {"$literal": v} for k, v in update_data.items()}}, *URGENCY_SCORE_PIPELINE]
+        existing_task = await db.tasks.find_one_and_update(
+            {"id": task_id}, update_pipeline, return_document=ReturnDocument.BEFORE
+        )
+        if not existing_task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        invalidate_recommendations()
+        
         # If task is being completed with actual hours, store learning data
         if task_update.status == "completed" and task_update.actual_hours is not None:
+            estimated_hours = existing_task['estimated_hours']
             learning_record = LearningData(
                 task_id=task_id,
-                estimated_hours=existing_task['estimated_hours'],
+                estimated_hours=estimated_hours,
                 actual_hours=task_update.actual_hours,
-                accuracy_ratio=task_update.actual_hours / existing_task['estimated_hours'],
+                accuracy_ratio=task_update.actual_hours / estimated_hours if estimated_hours > 0 else 1.0,
                 complexity=existing_task['complexity'],
                 tags=existing_task['tags'],
                 completion_date=datetime.now(timezone.utc).isoformat(),
                 notes=f"Task: {existing_task['title']}"
             )
             
-            learning_data = prepare_for_mongo(learning_record.dict())
+            # The raw record and the running sums are separate writes; if the
+            # second one is lost, build_learning_aggregates rebuilds the sums on
+            # the next startup because the counts no longer match
+            learning_data = learning_record.model_dump(mode="json")
             await db.learning_data.insert_one(learning_data)
-        
-        # Update task
-        prepared_update = prepare_for_mongo(update_data)
-        result = await db.tasks.update_one({"id": task_id}, {"$set": prepared_update})
-        
-        if result.matched_count:
-            updated_task = await db.tasks.find_one({"id": task_id})
-            return Task(**parse_from_mongo(updated_task))
-        else:
-            raise HTTPException(status_code=404, detail="Task not found")
+            await db.learning_aggregates.update_one(
+                {"_id": LEARNING_AGGREGATE_ID},
+                learning_aggregate_update(learning_record.estimated_hours, learning_record.actual_hours,
+                                          learning_record.complexity, learning_record.tags),
+                upsert=True
+            )
+            # A recommendation computed between the task write and the learning
+            # writes would cache the old accuracy data, so bump the version again
+            invalidate_recommendations()
+
+        return Task(**parse_from_mongo({**existing_task, **update_data}))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating task: {str(e)}")
 
@@ -619,6 +1029,7 @@ async def update_task(task_id: str, task_update: TaskUpdate):
 async def delete_task(task_id: str):
     try:
         result = await db.tasks.delete_one({"id": task_id})
+        invalidate_recommendations()
         if result.deleted_count:
             return {"message": "Task deleted successfully"}
         else:
@@ -628,9 +1039,24 @@ async def delete_task(task_id: str):
 
 @app.get("/api/recommendations/daily")
 async def get_daily_recommendations():
+    # Serve polling clients from a short-lived cache of the current hour's plan
+    cache_key = (tasks_version, datetime.now(timezone.utc).strftime("%Y-%m-%dT%H"))
+    if cache_key in recommendations_cache:
+        return recommendations_cache[cache_key]
+    
+    # Only one request recomputes; the rest wait and reuse its result
+    async with recommendations_lock:
+        if cache_key not in recommendations_cache:
+            recommendations_cache[cache_key] = await build_daily_recommendations()
+        return recommendations_cache[cache_key]
+
+async def build_daily_recommendations() -> Dict[str, Any]:
     try:
-        # Get all pending and in-progress tasks
-        tasks = await db.tasks.find({"status": {"$in": ["pending", "in_progress"]}}).to_list(length=None)
+        # Get the most urgent pending and in-progress tasks
+        tasks = await db.tasks.find(
+            {"status": {"$in": ["pending", "in_progress"]}},
+            {"_id": 0, "id": 1, "title": 1, "deadline": 1, "priority": 1, "complexity": 1, "tags": 1, "estimated_hours": 1}
+        ).sort("urgency_score", -1).limit(RECOMMENDATION_CANDIDATES).to_list(length=None)
         
         if not tasks:
             return {
@@ -643,30 +1069,18 @@ async def get_daily_recommendations():
             }
         
         # Get user's learning insights
-        learning_data = await db.learning_data.find().to_list(length=None)
-        insights = calculate_learning_insights(learning_data)
-        
-        # Sort tasks by urgency and priority
-        def task_urgency_score(task):
-            deadline = datetime.fromisoformat(task['deadline'].replace('Z', '+00:00'))
-            days_until = (deadline - datetime.now(timezone.utc)).days
-            
-            priority_weight = {"high": 3, "medium": 2, "low": 1}
-            priority_score = priority_weight.get(task.get('priority', 'medium'), 2)
-            
-            # Urgency decreases as days increase
-            urgency_score = max(1, 10 / max(1, days_until))
-            
-            return urgency_score * priority_score
-        
-        sorted_tasks = sorted(tasks, key=task_urgency_score, reverse=True)
+        insights = await get_learning_insights()
         
         # Calculate daily recommendations
         available_hours = 6.0  # 8-4 with teaching breaks
         total_allocated = 0
         recommended_tasks = []
         
-        for task in sorted_tasks:
+        # Parse each deadline once and use a single reference time
+        now = datetime.now(timezone.utc)
+        deadlines = {task['id']: parse_deadline(task['deadline']) for task in tasks}
+        
+        for task in tasks:
             if total_allocated >= available_hours:
                 break
                 
@@ -686,8 +1100,7 @@ async def get_daily_recommendations():
             adjusted_estimate = base_estimate * insights['pace_factor'] * complexity_factor * tag_factor
             
             # Calculate days until deadline
-            deadline = datetime.fromisoformat(task['deadline'].replace('Z', '+00:00'))
-            days_until = max(1, (deadline - datetime.now(timezone.utc)).days)
+            days_until = max(1, (deadlines[task['id']] - now).days)
             
             # Calculate minimum daily effort needed
             min_daily_effort = min(available_hours, adjusted_estimate / days_until)
@@ -727,7 +1140,7 @@ async def get_daily_recommendations():
             "total_hours": round(total_allocated, 1),
             "available_hours": available_hours,
             "workload_status": workload_status,
-            "timetable": [slot.dict() for slot in timetable_slots]
+            "timetable": [slot.model_dump() for slot in timetable_slots]
         }
         
     except Exception as e:
@@ -744,7 +1157,7 @@ async def get_schedule():
 @app.post("/api/schedule", response_model=Schedule)
 async def create_schedule_item(schedule: Schedule):
     try:
-        schedule_data = prepare_for_mongo(schedule.dict())
+        schedule_data = schedule.model_dump(mode="json")
         result = await db.schedule.insert_one(schedule_data)
         if result.inserted_id:
             return schedule
@@ -756,19 +1169,19 @@ async def create_schedule_item(schedule: Schedule):
 @app.get("/api/analytics/learning")
 async def get_learning_analytics():
     try:
-        learning_data_raw = await db.learning_data.find().to_list(length=None)
-        learning_data = [parse_from_mongo(item) for item in learning_data_raw]
-        insights = calculate_learning_insights(learning_data)
+        aggregate = await db.learning_aggregates.find_one({"_id": LEARNING_AGGREGATE_ID})
+        insights = calculate_learning_insights(aggregate)
         
         # Calculate additional analytics
-        recent_tasks = sorted(learning_data, key=lambda x: x['completion_date'], reverse=True)[:10]
+        recent_tasks_raw = await db.learning_data.find().sort("completion_date", -1).limit(10).to_list(length=None)
+        recent_tasks = [parse_from_mongo(item) for item in recent_tasks_raw]
         
         analytics = {
-            "total_completed_tasks": len(learning_data),
+            "total_completed_tasks": aggregate.get('count', 0) if aggregate else 0,
             "overall_pace_factor": round(insights['pace_factor'], 2),
             "complexity_insights": {k: round(v, 2) for k, v in insights['complexity_adjustments'].items()},
             "tag_performance": {k: round(v, 2) for k, v in insights['tag_insights'].items()},
-            "recent_completions": [parse_from_mongo(task) for task in recent_tasks[:5]],
+            "recent_completions": recent_tasks[:5],
             "accuracy_trend": [
                 {
                     "task_title": task.get('notes', 'Unknown'),
@@ -789,17 +1202,19 @@ async def get_learning_analytics():
 async def add_teaching_schedule(teaching_times: List[Dict[str, str]]):
     """Add teaching schedule to block out unavailable times"""
     try:
-        for item in teaching_times:
-            schedule = Schedule(
+        schedule_data = [
+            Schedule(
                 day_of_week=item['day'],
                 start_time=item['start_time'],
                 end_time=item['end_time'],
                 activity_type="teaching",
                 description=item.get('description', 'Teaching time')
-            )
-            
-            schedule_data = prepare_for_mongo(schedule.dict())
-            await db.schedule.insert_one(schedule_data)
+            ).model_dump(mode="json")
+            for item in teaching_times
+        ]
+        
+        if schedule_data:
+            await db.schedule.insert_many(schedule_data, ordered=False)
         
         return {"message": f"Added {len(teaching_times)} teaching schedule items"}
     except Exception as e:
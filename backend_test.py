@@ -4,23 +4,100 @@ Comprehensive Backend API Testing for Workflow Organizer App
 Tests all API endpoints including AI integration, CRUD operations, and analytics
 """
 
-import requests
+import asyncio
+import httpx
 import json
+import orjson
+import sys
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import uuid
 
+from tests.ai_polling import AI_POLL_TIMEOUT, wait_for_ai_analysis_async
+from tests.fixture_cache import cached_post_async, load_fixture, store_fixture
+from tests.http_client import async_client, response_json
+
 # Configuration
 BASE_URL = "https://taskoptimizer.preview.emergentagent.com"
 API_BASE = f"{BASE_URL}/api"
 
+# Endpoint URLs built once; per-task URLs append the id to URL_TASKS
+URL_TASKS = f"{API_BASE}/tasks"
+URL_TASKS_BATCH = f"{API_BASE}/tasks/batch"
+URL_BULK = f"{API_BASE}/tasks/bulk-import"
+URL_SCHEDULE = f"{API_BASE}/schedule"
+URL_TEACHING = f"{API_BASE}/schedule/teaching"
+URL_ANALYTICS = f"{API_BASE}/analytics/learning"
+URL_RECS = f"{API_BASE}/recommendations/daily"
+
+# Static request payloads are serialized once at import rather than on every post
+BULK_VALID_DATA = {
+    "task_text": "Opening Evening — 25 Sep 2025\nOpen Morning — 24 Sep 2025\nINSET Day — 26 Sep 2025\nGrade Midterm Examinations — 27 Sep 2025",
+    "default_priority": "medium"
+}
+BULK_DATE_FORMATS_DATA = {
+    "task_text": "Staff Meeting — Sep 30 2025\nParent Conference — 01/10/2025\nLecture Prep — 2025-10-05",
+    "default_priority": "high"
+}
+BULK_EMPTY_DATA = {
+    "task_text": "",
+    "default_priority": "medium"
+}
+SCHEDULE_DATA = {
+    "day_of_week": "monday",
+    "start_time": "09:00",
+    "end_time": "11:00",
+    "activity_type": "work",
+    "description": "Research and writing block"
+}
+TEACHING_DATA = [
+    {
+        "day": "tuesday",
+        "start_time": "10:00",
+        "end_time": "12:00",
+        "description": "Advanced Statistics Course"
+    },
+    {
+        "day": "thursday",
+        "start_time": "14:00",
+        "end_time": "16:00",
+        "description": "Machine Learning Seminar"
+    }
+]
+COMPLETION_DATA = {
+    "status": "completed",
+    "priority": "high",
+    "actual_hours": 6.5
+}
+
+BULK_VALID_BODY = orjson.dumps(BULK_VALID_DATA)
+BULK_DATE_FORMATS_BODY = orjson.dumps(BULK_DATE_FORMATS_DATA)
+BULK_EMPTY_BODY = orjson.dumps(BULK_EMPTY_DATA)
+SCHEDULE_BODY = orjson.dumps(SCHEDULE_DATA)
+TEACHING_BODY = orjson.dumps(TEACHING_DATA)
+COMPLETION_BODY = orjson.dumps(COMPLETION_DATA)
+
 class WorkflowOrganizerTester:
     def __init__(self):
-        self.session = requests.Session()
+        self.client: httpx.AsyncClient = None  # Opened for the duration of run_all_tests
         self.test_results = []
-        self.created_task_ids = []
-        self.created_schedule_ids = []
+        # Clock read once per run: log entries store offsets and deadlines are preformatted
+        self._t0 = datetime.now(timezone.utc)
+        self._t0_mono = time.monotonic()
+        self.deadlines = {days: (self._t0 + timedelta(days=days)).isoformat() for days in (2, 3, 7, 14)}
+        self._passed = 0  # Running tallies so the summary needs no rescans
+        self._failures = []
+        self._log_buf = []  # Rendered log entries, written out once after the run
+        # Insertion-ordered dicts: O(1) membership/removal
+        self.created_task_ids: Dict[str, None] = {}
+        # Specific targets for the read/update/delete tests, independent of creation order
+        self.ai_task_id: Optional[str] = None
+        self.additional_task_ids: List[str] = []
+        self.created_schedule_ids: Dict[str, None] = {}
+        # The analytics count is database-wide, so completions are measured against a baseline
+        self._completed_baseline = 0
+        self._expected_completed = 0  # Completions the learning analytics should reflect
         
     def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test results"""
@@ -28,25 +105,45 @@ class WorkflowOrganizerTester:
             "test": test_name,
             "success": success,
             "details": details,
-            "timestamp": datetime.now().isoformat(),
-            "response_data": response_data
+            "elapsed": time.monotonic() - self._t0_mono,
+            # Response bodies are only worth keeping for failures
+            "response_data": None if success else response_data
         }
         self.test_results.append(result)
+        self._passed += int(success)
+        if not success:
+            self._failures.append(f"  - {test_name}: {details}")
+        
+        # Entries are buffered and rendered together by flush_log
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name}")
+        lines = [f"{status}: {test_name}"]
         if details:
-            print(f"   Details: {details}")
+            lines.append(f"   Details: {details}")
         if not success and response_data:
-            print(f"   Response: {response_data}")
-        print()
+            rendered = orjson.dumps(response_data, option=orjson.OPT_INDENT_2, default=str).decode()
+            lines.append(f"   Response: {rendered}")
+        self._log_buf.append("\n".join(lines) + "\n\n")
+
+    def flush_log(self):
+        """Write all buffered log entries to stdout in one call"""
+        sys.stdout.write("".join(self._log_buf))
+        sys.stdout.flush()
+        self._log_buf.clear()
+
+    def primary_task_id(self) -> Optional[str]:
+        """Task read and deleted by the single-task tests: the AI-created one, or the first
+        additional task when that creation was replayed from a fixture"""
+        if self.ai_task_id:
+            return self.ai_task_id
+        return self.additional_task_ids[0] if self.additional_task_ids else None
 
-    def test_health_check(self):
+    async def test_health_check(self):
         """Test basic server health check"""
         try:
             # Test the tasks endpoint as a health check since root is served by frontend
-            response = self.session.get(f"{API_BASE}/tasks", timeout=10)
+            response = await self.client.get(URL_TASKS, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if isinstance(data, list):
                     self.log_test("Health Check", True, f"API responding: tasks endpoint returned {len(data)} tasks")
                     return True
@@ -60,21 +157,36 @@ class WorkflowOrganizerTester:
             self.log_test("Health Check", False, f"Connection error: {str(e)}")
             return False
 
-    def test_create_task_with_ai(self):
+    async def test_create_task_with_ai(self):
         """Test task creation with AI analysis"""
         try:
             # Test with a realistic research task
             task_data = {
                 "title": "Research Machine Learning Algorithms for Student Assessment",
                 "description": "Conduct comprehensive research on ML algorithms suitable for automated student assessment systems. Need to analyze accuracy, bias, and implementation complexity of different approaches including neural networks, decision trees, and ensemble methods.",
-                "deadline": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat(),
+                "deadline": self.deadlines[7],
                 "priority": "high"
             }
             
-            response = self.session.post(f"{API_BASE}/tasks", json=task_data, timeout=30)
+            # The fixture for this endpoint is the completed task, not the provisional
+            # POST body, so it is loaded and stored here rather than via cached_post_async
+            response = load_fixture(URL_TASKS, task_data)
+            if response is None:
+                response = await self.client.post(URL_TASKS, content=orjson.dumps(task_data), timeout=30)
+                if response.status_code == 200:
+                    self.ai_task_id = response_json(response)["id"]
+                    self.created_task_ids[self.ai_task_id] = None
+                    response = await wait_for_ai_analysis_async(self.client, f"{URL_TASKS}/{self.ai_task_id}")
+                    if response.status_code == 200 and response_json(response).get("ai_status") == "completed":
+                        store_fixture(URL_TASKS, task_data, response)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
+                if data.get("ai_status") != "completed":
+                    self.log_test("Create Task with AI", False,
+                                f"AI analysis still {data.get('ai_status')} after {AI_POLL_TIMEOUT}s", data)
+                    return False
+                
                 required_fields = ["id", "title", "description", "estimated_hours", "complexity", "ai_analysis"]
                 
                 missing_fields = [field for field in required_fields if field not in data]
@@ -84,7 +196,6 @@ class WorkflowOrganizerTester:
                 
                 # Verify AI analysis worked
                 if data.get("estimated_hours", 0) > 0 and data.get("ai_analysis"):
-                    self.created_task_ids.append(data["id"])
                     self.log_test("Create Task with AI", True, 
                                 f"Task created with AI analysis. Estimated: {data['estimated_hours']}h, "
                                 f"Complexity: {data['complexity']}, Analysis: {data['ai_analysis'][:100]}...")
@@ -100,56 +211,58 @@ class WorkflowOrganizerTester:
             self.log_test("Create Task with AI", False, f"Error: {str(e)}")
             return False
 
-    def test_create_additional_tasks(self):
+    async def test_create_additional_tasks(self):
         """Create additional tasks for testing recommendations and analytics"""
         tasks = [
             {
                 "title": "Prepare Advanced Statistics Lecture",
                 "description": "Create comprehensive lecture materials for advanced statistics course covering hypothesis testing, ANOVA, and regression analysis. Include interactive examples and practice problems.",
-                "deadline": (datetime.now(timezone.utc) + timedelta(days=3)).isoformat(),
+                "deadline": self.deadlines[3],
                 "priority": "medium"
             },
             {
                 "title": "Grade Midterm Examinations",
                 "description": "Grade 45 midterm exams for Introduction to Data Science course. Provide detailed feedback on each student's performance and identify common areas of difficulty.",
-                "deadline": (datetime.now(timezone.utc) + timedelta(days=2)).isoformat(),
+                "deadline": self.deadlines[2],
                 "priority": "high"
             },
             {
                 "title": "Update Course Curriculum",
                 "description": "Review and update the machine learning course curriculum to include latest industry trends and technologies. Add modules on transformer models and ethical AI.",
-                "deadline": (datetime.now(timezone.utc) + timedelta(days=14)).isoformat(),
+                "deadline": self.deadlines[14],
                 "priority": "low"
             }
         ]
         
-        success_count = 0
-        for i, task_data in enumerate(tasks):
-            try:
-                response = self.session.post(f"{API_BASE}/tasks", json=task_data, timeout=30)
-                if response.status_code == 200:
-                    data = response.json()
-                    self.created_task_ids.append(data["id"])
-                    success_count += 1
+        try:
+            # One batch request analyzes and stores all tasks together
+            response = await self.client.post(URL_TASKS_BATCH, content=orjson.dumps(tasks), timeout=30)
+            if response.status_code == 200:
+                data = response_json(response)
+                for task in data:
+                    self.created_task_ids[task["id"]] = None
+                self.additional_task_ids = [task["id"] for task in data]
+                
+                if len(data) == len(tasks):
+                    self.log_test("Create Additional Tasks", True, f"Successfully created {len(data)} additional tasks")
+                    return True
                 else:
-                    self.log_test(f"Create Additional Task {i+1}", False, f"HTTP {response.status_code}: {response.text}")
-            except Exception as e:
-                self.log_test(f"Create Additional Task {i+1}", False, f"Error: {str(e)}")
-        
-        if success_count == len(tasks):
-            self.log_test("Create Additional Tasks", True, f"Successfully created {success_count} additional tasks")
-            return True
-        else:
-            self.log_test("Create Additional Tasks", False, f"Only created {success_count}/{len(tasks)} tasks")
+                    self.log_test("Create Additional Tasks", False, f"Only created {len(data)}/{len(tasks)} tasks")
+                    return False
+            else:
+                self.log_test("Create Additional Tasks", False, f"HTTP {response.status_code}: {response.text}")
+                return False
+        except Exception as e:
+            self.log_test("Create Additional Tasks", False, f"Error: {str(e)}")
             return False
 
-    def test_get_all_tasks(self):
+    async def test_get_all_tasks(self):
         """Test fetching all tasks"""
         try:
-            response = self.session.get(f"{API_BASE}/tasks", timeout=10)
+            response = await self.client.get(URL_TASKS, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if isinstance(data, list) and len(data) >= len(self.created_task_ids):
                     self.log_test("Get All Tasks", True, f"Retrieved {len(data)} tasks")
                     return True
@@ -164,18 +277,18 @@ class WorkflowOrganizerTester:
             self.log_test("Get All Tasks", False, f"Error: {str(e)}")
             return False
 
-    def test_get_single_task(self):
+    async def test_get_single_task(self):
         """Test fetching a single task by ID"""
-        if not self.created_task_ids:
+        task_id = self.primary_task_id()
+        if not task_id:
             self.log_test("Get Single Task", False, "No task IDs available for testing")
             return False
             
         try:
-            task_id = self.created_task_ids[0]
-            response = self.session.get(f"{API_BASE}/tasks/{task_id}", timeout=10)
+            response = await self.client.get(f"{URL_TASKS}/{task_id}", timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if data.get("id") == task_id:
                     self.log_test("Get Single Task", True, f"Retrieved task: {data.get('title', 'Unknown')}")
                     return True
@@ -190,38 +303,28 @@ class WorkflowOrganizerTester:
             self.log_test("Get Single Task", False, f"Error: {str(e)}")
             return False
 
-    def test_update_task(self):
+    async def test_update_task(self):
         """Test updating a task including completion with actual hours"""
-        if not self.created_task_ids:
+        if not self.additional_task_ids:
             self.log_test("Update Task", False, "No task IDs available for testing")
             return False
             
         try:
-            task_id = self.created_task_ids[-1]  # Use last created task
-            
-            # First update - mark as in progress
-            update_data = {
-                "status": "in_progress",
-                "priority": "high"
-            }
-            
-            response = self.session.put(f"{API_BASE}/tasks/{task_id}", json=update_data, timeout=10)
+            task_id = self.additional_task_ids[-1]  # Use the last task of the batch
             
-            if response.status_code != 200:
-                self.log_test("Update Task", False, f"HTTP {response.status_code}: {response.text}")
-                return False
-            
-            # Second update - complete with actual hours (for learning system)
-            completion_data = {
-                "status": "completed",
-                "actual_hours": 6.5
-            }
+            # Record the existing completion count before adding ours
+            response = await self.client.get(URL_ANALYTICS, timeout=10)
+            if response.status_code == 200:
+                self._completed_baseline = response_json(response).get("total_completed_tasks", 0)
             
-            response = self.session.put(f"{API_BASE}/tasks/{task_id}", json=completion_data, timeout=10)
+            # Single update - reprioritize and complete with actual hours (for learning system)
+            response = await self.client.put(f"{URL_TASKS}/{task_id}", content=COMPLETION_BODY, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
-                if data.get("status") == "completed" and data.get("actual_hours") == 6.5:
+                data = response_json(response)
+                if (data.get("status") == "completed" and data.get("actual_hours") == 6.5 and
+                        data.get("priority") == "high"):
+                    self._expected_completed += 1
                     self.log_test("Update Task", True, f"Task completed with actual hours: {data.get('actual_hours')}h")
                     return True
                 else:
@@ -235,13 +338,13 @@ class WorkflowOrganizerTester:
             self.log_test("Update Task", False, f"Error: {str(e)}")
             return False
 
-    def test_daily_recommendations(self):
+    async def test_daily_recommendations(self):
         """Test daily work recommendations"""
         try:
-            response = self.session.get(f"{API_BASE}/recommendations/daily", timeout=15)
+            response = await self.client.get(URL_RECS, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 required_fields = ["date", "tasks", "total_hours", "available_hours", "workload_status"]
                 
                 missing_fields = [field for field in required_fields if field not in data]
@@ -271,23 +374,15 @@ class WorkflowOrganizerTester:
             self.log_test("Daily Recommendations", False, f"Error: {str(e)}")
             return False
 
-    def test_create_schedule(self):
+    async def test_create_schedule(self):
         """Test creating schedule items"""
         try:
-            schedule_data = {
-                "day_of_week": "monday",
-                "start_time": "09:00",
-                "end_time": "11:00",
-                "activity_type": "work",
-                "description": "Research and writing block"
-            }
-            
-            response = self.session.post(f"{API_BASE}/schedule", json=schedule_data, timeout=10)
+            response = await self.client.post(URL_SCHEDULE, content=SCHEDULE_BODY, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if data.get("day_of_week") == "monday" and data.get("activity_type") == "work":
-                    self.created_schedule_ids.append(data.get("id"))
+                    self.created_schedule_ids[data.get("id")] = None
                     self.log_test("Create Schedule", True, f"Schedule created: {data.get('description')}")
                     return True
                 else:
@@ -301,13 +396,13 @@ class WorkflowOrganizerTester:
             self.log_test("Create Schedule", False, f"Error: {str(e)}")
             return False
 
-    def test_get_schedule(self):
+    async def test_get_schedule(self):
         """Test fetching schedule"""
         try:
-            response = self.session.get(f"{API_BASE}/schedule", timeout=10)
+            response = await self.client.get(URL_SCHEDULE, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if isinstance(data, list):
                     self.log_test("Get Schedule", True, f"Retrieved {len(data)} schedule items")
                     return True
@@ -322,28 +417,13 @@ class WorkflowOrganizerTester:
             self.log_test("Get Schedule", False, f"Error: {str(e)}")
             return False
 
-    def test_teaching_schedule(self):
+    async def test_teaching_schedule(self):
         """Test adding teaching schedule"""
         try:
-            teaching_data = [
-                {
-                    "day": "tuesday",
-                    "start_time": "10:00",
-                    "end_time": "12:00",
-                    "description": "Advanced Statistics Course"
-                },
-                {
-                    "day": "thursday",
-                    "start_time": "14:00",
-                    "end_time": "16:00",
-                    "description": "Machine Learning Seminar"
-                }
-            ]
-            
-            response = self.session.post(f"{API_BASE}/schedule/teaching", json=teaching_data, timeout=10)
+            response = await self.client.post(URL_TEACHING, content=TEACHING_BODY, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if "message" in data and "2" in data["message"]:
                     self.log_test("Teaching Schedule", True, f"Added teaching schedule: {data['message']}")
                     return True
@@ -358,16 +438,20 @@ class WorkflowOrganizerTester:
             self.log_test("Teaching Schedule", False, f"Error: {str(e)}")
             return False
 
-    def test_learning_analytics(self):
+    async def test_learning_analytics(self):
         """Test learning analytics endpoint"""
         try:
-            # Wait a moment for learning data to be processed
-            time.sleep(2)
-            
-            response = self.session.get(f"{API_BASE}/analytics/learning", timeout=10)
+            # Poll until the learning data reflects our completions, for at most ~2s
+            expected_total = self._completed_baseline + self._expected_completed
+            for _ in range(20):
+                response = await self.client.get(URL_ANALYTICS, timeout=10)
+                if (response.status_code != 200 or
+                        response_json(response).get("total_completed_tasks", 0) >= expected_total):
+                    break
+                await asyncio.sleep(0.1)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 required_fields = ["total_completed_tasks", "overall_pace_factor", "complexity_insights", "tag_performance"]
                 
                 missing_fields = [field for field in required_fields if field not in data]
@@ -395,18 +479,14 @@ class WorkflowOrganizerTester:
             self.log_test("Learning Analytics", False, f"Error: {str(e)}")
             return False
 
-    def test_bulk_import_valid_format(self):
+    async def test_bulk_import_valid_format(self):
         """Test bulk task import with valid copy-paste format"""
         try:
-            bulk_data = {
-                "task_text": "Opening Evening — 25 Sep 2025\nOpen Morning — 24 Sep 2025\nINSET Day — 26 Sep 2025\nGrade Midterm Examinations — 27 Sep 2025",
-                "default_priority": "medium"
-            }
-            
-            response = self.session.post(f"{API_BASE}/tasks/bulk-import", json=bulk_data, timeout=30)
+            response = await cached_post_async(self.client.post, URL_BULK, BULK_VALID_DATA,
+                                               content=BULK_VALID_BODY, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 required_fields = ["message", "tasks_created", "tasks"]
                 
                 missing_fields = [field for field in required_fields if field not in data]
@@ -417,8 +497,9 @@ class WorkflowOrganizerTester:
                 # Verify correct number of tasks created
                 if data["tasks_created"] == 4 and len(data["tasks"]) == 4:
                     # Store created task IDs for cleanup
-                    for task in data["tasks"]:
-                        self.created_task_ids.append(task["id"])
+                    if not getattr(response, "from_cache", False):
+                        for task in data["tasks"]:
+                            self.created_task_ids[task["id"]] = None
                     
                     # Verify AI analysis was applied to each task
                     ai_analyzed_count = sum(1 for task in data["tasks"] if task.get("ai_analysis") and task.get("estimated_hours", 0) > 0)
@@ -444,23 +525,20 @@ class WorkflowOrganizerTester:
             self.log_test("Bulk Import Valid Format", False, f"Error: {str(e)}")
             return False
 
-    def test_bulk_import_different_date_formats(self):
+    async def test_bulk_import_different_date_formats(self):
         """Test bulk import with different date formats"""
         try:
-            bulk_data = {
-                "task_text": "Staff Meeting — Sep 30 2025\nParent Conference — 01/10/2025\nLecture Prep — 2025-10-05",
-                "default_priority": "high"
-            }
-            
-            response = self.session.post(f"{API_BASE}/tasks/bulk-import", json=bulk_data, timeout=30)
+            response = await cached_post_async(self.client.post, URL_BULK, BULK_DATE_FORMATS_DATA,
+                                               content=BULK_DATE_FORMATS_BODY, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 
                 if data["tasks_created"] == 3 and len(data["tasks"]) == 3:
                     # Store created task IDs for cleanup
-                    for task in data["tasks"]:
-                        self.created_task_ids.append(task["id"])
+                    if not getattr(response, "from_cache", False):
+                        for task in data["tasks"]:
+                            self.created_task_ids[task["id"]] = None
                     
                     # Verify all tasks have proper ISO format deadlines
                     valid_dates = 0
@@ -501,16 +579,11 @@ class WorkflowOrganizerTester:
             self.log_test("Bulk Import Different Date Formats", False, f"Error: {str(e)}")
             return False
 
-    def test_bulk_import_error_handling(self):
+    async def test_bulk_import_error_handling(self):
         """Test bulk import error handling for invalid formats"""
         try:
             # Test with empty task text
-            bulk_data = {
-                "task_text": "",
-                "default_priority": "medium"
-            }
-            
-            response = self.session.post(f"{API_BASE}/tasks/bulk-import", json=bulk_data, timeout=10)
+            response = await self.client.post(URL_BULK, content=BULK_EMPTY_BODY, timeout=10)
             
             if response.status_code == 400:
                 self.log_test("Bulk Import Error Handling", True, "Correctly rejected empty task text with 400 error")
@@ -524,13 +597,13 @@ class WorkflowOrganizerTester:
             self.log_test("Bulk Import Error Handling", False, f"Error: {str(e)}")
             return False
 
-    def test_recommendations_with_timetable(self):
+    async def test_recommendations_with_timetable(self):
         """Test that daily recommendations now include timetable field"""
         try:
-            response = self.session.get(f"{API_BASE}/recommendations/daily", timeout=15)
+            response = await self.client.get(URL_RECS, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 required_fields = ["date", "tasks", "total_hours", "available_hours", "workload_status", "timetable"]
                 
                 missing_fields = [field for field in required_fields if field not in data]
@@ -571,21 +644,21 @@ class WorkflowOrganizerTester:
             self.log_test("Recommendations with Timetable", False, f"Error: {str(e)}")
             return False
 
-    def test_delete_task(self):
+    async def test_delete_task(self):
         """Test deleting a task"""
-        if not self.created_task_ids:
+        task_id = self.primary_task_id()
+        if not task_id:
             self.log_test("Delete Task", False, "No task IDs available for testing")
             return False
             
         try:
-            task_id = self.created_task_ids[0]
-            response = self.session.delete(f"{API_BASE}/tasks/{task_id}", timeout=10)
+            response = await self.client.delete(f"{URL_TASKS}/{task_id}", timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 if "message" in data and "deleted" in data["message"].lower():
                     self.log_test("Delete Task", True, f"Task deleted: {data['message']}")
-                    self.created_task_ids.remove(task_id)
+                    self.created_task_ids.pop(task_id, None)
                     return True
                 else:
                     self.log_test("Delete Task", False, "Unexpected response format", data)
@@ -598,45 +671,59 @@ class WorkflowOrganizerTester:
             self.log_test("Delete Task", False, f"Error: {str(e)}")
             return False
 
-    def run_all_tests(self):
+    async def run_stages(self, stages):
+        """Run (name, deps, test) stages, gathering every stage whose dependencies have all finished"""
+        pending = list(stages)
+        completed = set()
+        while pending:
+            ready = [stage for stage in pending if stage[1] <= completed]
+            if not ready:
+                raise RuntimeError(f"Unsatisfiable test dependencies: {[name for name, _, _ in pending]}")
+            await asyncio.gather(*(test() for _, _, test in ready))
+            completed.update(name for name, _, _ in ready)
+            pending = [stage for stage in pending if stage[0] not in completed]
+
+    async def run_all_tests(self):
         """Run all backend tests"""
         print("🚀 Starting Comprehensive Backend API Testing")
         print("=" * 60)
         
-        # Core API tests
-        self.test_health_check()
-        
-        # Task management tests
-        self.test_create_task_with_ai()
-        self.test_create_additional_tasks()
-        self.test_get_all_tasks()
-        self.test_get_single_task()
-        self.test_update_task()
-        
-        # NEW: Bulk import feature tests
-        print("\n🔄 Testing NEW Bulk Import Feature:")
-        self.test_bulk_import_valid_format()
-        self.test_bulk_import_different_date_formats()
-        self.test_bulk_import_error_handling()
-        
-        # Advanced features (updated)
-        self.test_recommendations_with_timetable()  # Updated to test timetable field
-        self.test_learning_analytics()
-        
-        # Schedule management
-        self.test_create_schedule()
-        self.test_get_schedule()
-        self.test_teaching_schedule()
+        # Tests that create tasks; reads over the whole task list wait for all of them
+        creators = {"create_task_with_ai", "create_additional_tasks", "bulk_import_valid", "bulk_import_dates"}
+        stages = [
+            ("health_check", set(), self.test_health_check),
+            ("create_task_with_ai", set(), self.test_create_task_with_ai),
+            ("create_additional_tasks", set(), self.test_create_additional_tasks),
+            ("bulk_import_valid", set(), self.test_bulk_import_valid_format),
+            ("bulk_import_dates", set(), self.test_bulk_import_different_date_formats),
+            ("bulk_import_errors", set(), self.test_bulk_import_error_handling),
+            ("create_schedule", set(), self.test_create_schedule),
+            ("teaching_schedule", set(), self.test_teaching_schedule),
+            ("get_all_tasks", creators, self.test_get_all_tasks),
+            ("get_single_task", {"create_task_with_ai", "create_additional_tasks"}, self.test_get_single_task),
+            ("update_task", {"create_additional_tasks"}, self.test_update_task),
+            ("get_schedule", {"create_schedule", "teaching_schedule"}, self.test_get_schedule),
+            # Advanced features depend on the completed task
+            ("recommendations", creators | {"update_task"}, self.test_recommendations_with_timetable),
+            ("learning_analytics", creators | {"update_task"}, self.test_learning_analytics),
+            # Cleanup once nothing else reads the created tasks
+            ("delete_task", {"get_all_tasks", "get_single_task", "recommendations", "learning_analytics"},
+             self.test_delete_task),
+        ]
         
-        # Cleanup
-        self.test_delete_task()
+        async with async_client() as client:
+            self.client = client
+            try:
+                await self.run_stages(stages)
+            finally:
+                self.flush_log()
         
         # Summary
         print("=" * 60)
         print("📊 TEST SUMMARY")
         print("=" * 60)
         
-        passed = sum(1 for result in self.test_results if result["success"])
+        passed = self._passed
         total = len(self.test_results)
         
         print(f"Total Tests: {total}")
@@ -646,15 +733,13 @@ class WorkflowOrganizerTester:
         
         if total - passed > 0:
             print("\n❌ FAILED TESTS:")
-            for result in self.test_results:
-                if not result["success"]:
-                    print(f"  - {result['test']}: {result['details']}")
+            sys.stdout.write("\n".join(self._failures) + "\n")
         
         return passed == total
 
 if __name__ == "__main__":
     tester = WorkflowOrganizerTester()
-    success = tester.run_all_tests()
+    success = asyncio.run(tester.run_all_tests())
     
     if success:
         print("\n🎉 All tests passed! Backend is working correctly.")
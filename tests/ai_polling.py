@@ -0,0 +1,39 @@
+"""
+Polling helpers for tasks whose AI analysis runs in the background.
+
+create_task answers with a provisional estimate and ai_status "pending", then
+fills in the AI analysis after the response has been sent.
+"""
+
+import asyncio
+import time
+
+from tests.http_client import response_json
+
+AI_POLL_TIMEOUT = 60
+AI_POLL_INTERVAL = 0.5
+
+
+def ai_analysis_settled(response) -> bool:
+    """True once polling can stop: the task failed to load or its analysis completed"""
+    return response.status_code != 200 or response_json(response).get("ai_status") == "completed"
+
+
+def wait_for_ai_analysis(session, task_url: str, timeout: float = AI_POLL_TIMEOUT):
+    """Poll task_url with a synchronous client; returns the last response"""
+    give_up_at = time.monotonic() + timeout
+    while True:
+        response = session.get(task_url, timeout=10)
+        if ai_analysis_settled(response) or time.monotonic() >= give_up_at:
+            return response
+        time.sleep(AI_POLL_INTERVAL)
+
+
+async def wait_for_ai_analysis_async(client, task_url: str, timeout: float = AI_POLL_TIMEOUT):
+    """Async variant of wait_for_ai_analysis for httpx.AsyncClient"""
+    give_up_at = time.monotonic() + timeout
+    while True:
+        response = await client.get(task_url, timeout=10)
+        if ai_analysis_settled(response) or time.monotonic() >= give_up_at:
+            return response
+        await asyncio.sleep(AI_POLL_INTERVAL)
@@ -0,0 +1,83 @@
+"""
+Record/replay cache for the AI-analysed task responses used by the API test scripts.
+
+FIXTURES_MODE=record  always calls the API and stores successful response bodies
+FIXTURES_MODE=replay  serves stored bodies without a network call, falling through on a miss
+unset / anything else  caching is disabled and every request hits the API
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import urlsplit
+
+FIXTURES_MODE = os.environ.get("FIXTURES_MODE", "").lower()
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+# Deadlines are computed relative to "now", so they must not be part of the key
+VOLATILE_FIELDS = ("deadline",)
+
+
+class CachedResponse:
+    """Minimal stand-in for a requests/httpx response served from the fixture cache"""
+
+    status_code = 200
+    from_cache = True
+
+    def __init__(self, body):
+        self._body = body
+        self.text = json.dumps(body)
+        self.content = self.text.encode()
+
+    def json(self):
+        return self._body
+
+
+def fixture_path(url: str, payload: dict) -> Path:
+    stable = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+    key = json.dumps({"path": urlsplit(url).path, "body": stable}, sort_keys=True)
+    return CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+def load_fixture(url: str, payload: dict):
+    if FIXTURES_MODE != "replay":
+        return None
+    path = fixture_path(url, payload)
+    if not path.exists():
+        return None
+    return CachedResponse(json.loads(path.read_text()))
+
+
+def store_fixture(url: str, payload: dict, response):
+    if FIXTURES_MODE != "record" or response.status_code != 200:
+        return
+    CACHE_DIR.mkdir(exist_ok=True)
+    fixture_path(url, payload).write_text(json.dumps(response.json(), indent=2, sort_keys=True))
+
+
+def request_kwargs(payload: dict, kwargs: dict) -> dict:
+    # Callers may pass a pre-serialized body (data=/content=); payload is then only the cache key
+    if "data" in kwargs or "content" in kwargs:
+        return kwargs
+    return {**kwargs, "json": payload}
+
+
+def cached_post(post, url: str, payload: dict, **kwargs):
+    """POST through a requests-style callable, using the fixture cache when enabled"""
+    cached = load_fixture(url, payload)
+    if cached is not None:
+        return cached
+    response = post(url, **request_kwargs(payload, kwargs))
+    store_fixture(url, payload, response)
+    return response
+
+
+async def cached_post_async(post, url: str, payload: dict, **kwargs):
+    """Async variant of cached_post for httpx.AsyncClient.post"""
+    cached = load_fixture(url, payload)
+    if cached is not None:
+        return cached
+    response = await post(url, **request_kwargs(payload, kwargs))
+    store_fixture(url, payload, response)
+    return response
@@ -0,0 +1,46 @@
+"""
+Shared HTTP client configuration for the API test scripts.
+
+Both scripts hit the same preview host, so they share one pooled HTTP/2 client
+(sync) or build their async client from the same settings.
+"""
+
+import httpx
+import orjson
+
+# Brotli responses are decoded transparently by httpx when the brotli package is installed
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, br",
+    "User-Agent": "WorkflowTester/1.0",
+}
+DEFAULT_TIMEOUT = 30
+POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=20)
+CONNECT_RETRIES = 2
+
+
+def response_json(response):
+    """Decode a response body straight from bytes with orjson"""
+    return orjson.loads(response.content)
+
+
+def sync_client() -> httpx.Client:
+    return httpx.Client(
+        transport=httpx.HTTPTransport(http2=True, limits=POOL_LIMITS, retries=CONNECT_RETRIES),
+        headers=DEFAULT_HEADERS,
+        timeout=DEFAULT_TIMEOUT,
+    )
+
+
+def async_client() -> httpx.AsyncClient:
+    """Async clients are bound to the running event loop, so each run builds its own"""
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=POOL_LIMITS, retries=CONNECT_RETRIES),
+        headers=DEFAULT_HEADERS,
+        timeout=DEFAULT_TIMEOUT,
+    )
+
+
+# Module-level keep-alive client shared by every synchronous caller in the process
+SESSION = sync_client()